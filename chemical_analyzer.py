@@ -29,6 +29,40 @@ ATOMIC_MASS = {
     'Lv': 293.0, 'Ts': 294.0, 'Og': 294.0
 }
 
+# Monoisotopic mass database: mass of the most abundant isotope (u)
+# Used for mass spectrometry; covers elements common in analyzed compounds
+MONOISOTOPIC_MASS = {
+    'H': 1.00782503207, 'He': 4.00260325415, 'Li': 7.01600455, 'Be': 9.0121822,
+    'B': 11.0093054, 'C': 12.0, 'N': 14.0030740048, 'O': 15.99491461956,
+    'F': 18.99840322, 'Ne': 19.9924401754, 'Na': 22.9897692809, 'Mg': 23.985041700,
+    'Al': 26.98153863, 'Si': 27.9769265325, 'P': 30.97376163, 'S': 31.97207100,
+    'Cl': 34.96885268, 'Ar': 39.9623831225, 'K': 38.96370668, 'Ca': 39.96259098,
+    'Sc': 44.9559119, 'Ti': 47.9479463, 'V': 50.9439595, 'Cr': 51.9405075,
+    'Mn': 54.9380451, 'Fe': 55.9349375, 'Co': 58.9331950, 'Ni': 57.9353429,
+    'Cu': 62.9295975, 'Zn': 63.9291422, 'Ga': 68.9255736, 'Ge': 73.9211778,
+    'As': 74.9215965, 'Se': 79.9165213, 'Br': 78.9183371, 'Kr': 83.911507,
+    'Rb': 84.911789738, 'Sr': 87.9056121, 'Y': 88.9058483, 'Zr': 89.9047044,
+    'Nb': 92.9063781, 'Mo': 97.9054082, 'Ru': 101.9043493, 'Rh': 102.905504,
+    'Pd': 105.903486, 'Ag': 106.905097, 'Cd': 113.9033585, 'In': 114.903878,
+    'Sn': 119.9021947, 'Sb': 120.9038157, 'Te': 129.9062244, 'I': 126.904473,
+    'Xe': 131.9041535, 'Cs': 132.905451933, 'Ba': 137.9052472, 'W': 183.9509312,
+    'Pt': 194.9647911, 'Au': 196.9665687, 'Hg': 201.970643, 'Tl': 204.9744275,
+    'Pb': 207.9766521, 'Bi': 208.9803987, 'U': 238.0507882
+}
+
+# Metals and metalloids for which degree of unsaturation does not apply
+METALLIC_ELEMENTS = {'Li', 'Be', 'Na', 'Mg', 'Al', 'K', 'Ca', 'Sc', 'Ti', 'V', 
+                     'Cr', 'Mn', 'Fe', 'Co', 'Ni', 'Cu', 'Zn', 'Ga', 'Rb', 'Sr',
+                     'Y', 'Zr', 'Nb', 'Mo', 'Tc', 'Ru', 'Rh', 'Pd', 'Ag', 'Cd',
+                     'In', 'Sn', 'Sb', 'Cs', 'Ba', 'La', 'Hf', 'Ta', 'W', 'Re',
+                     'Os', 'Ir', 'Pt', 'Au', 'Hg', 'Tl', 'Pb', 'Bi', 'Po', 'Fr',
+                     'Ra', 'Ac', 'Th', 'Pa', 'U', 'Np', 'Pu', 'Am', 'Cm', 'Bk',
+                     'Cf', 'Es', 'Fm', 'Md', 'No', 'Lr', 'Rf', 'Db', 'Sg', 'Bh',
+                     'Hs', 'Mt', 'Ds', 'Rg', 'Cn', 'Nh', 'Fl', 'Mc', 'Lv', 'Ts', 'Og'}
+
+# Metals that mark a carbon compound as organometallic
+CLASSIFICATION_METALS = {'Na', 'K', 'Ca', 'Mg', 'Fe', 'Cu', 'Zn', 'Ag', 'Au'}
+
 def parse_chemical_formula(formula):
     """
     Parse a chemical formula into elemental composition dictionary
@@ -162,6 +196,22 @@ def calculate_molecular_weight(elements_count):
         molecular_weight += ATOMIC_MASS.get(element, 0) * count
     return molecular_weight
 
+def calculate_monoisotopic_mass(elements_count):
+    """
+    Calculate monoisotopic mass from element counts
+    
+    Args:
+        elements_count (dict): Dictionary of element counts
+    
+    Returns:
+        float: Monoisotopic mass in u (Da)
+    """
+    monoisotopic_mass = 0.0
+    for element, count in elements_count.items():
+        # Add most abundant isotope mass multiplied by count for each element
+        monoisotopic_mass += MONOISOTOPIC_MASS.get(element, 0) * count
+    return monoisotopic_mass
+
 def calculate_element_percentages(elements_count, molecular_weight):
     """
     Calculate mass percentage composition of each element
@@ -193,16 +243,8 @@ def calculate_unsaturation_degree(elements_count):
     Returns:
         int or str: Degree of unsaturation or message for inorganic compounds
     """
-    metallic_elements = {'Li', 'Be', 'Na', 'Mg', 'Al', 'K', 'Ca', 'Sc', 'Ti', 'V', 
-                        'Cr', 'Mn', 'Fe', 'Co', 'Ni', 'Cu', 'Zn', 'Ga', 'Rb', 'Sr',
-                        'Y', 'Zr', 'Nb', 'Mo', 'Tc', 'Ru', 'Rh', 'Pd', 'Ag', 'Cd',
-                        'In', 'Sn', 'Sb', 'Cs', 'Ba', 'La', 'Hf', 'Ta', 'W', 'Re',
-                        'Os', 'Ir', 'Pt', 'Au', 'Hg', 'Tl', 'Pb', 'Bi', 'Po', 'Fr',
-                        'Ra', 'Ac', 'Th', 'Pa', 'U', 'Np', 'Pu', 'Am', 'Cm', 'Bk',
-                        'Cf', 'Es', 'Fm', 'Md', 'No', 'Lr', 'Rf', 'Db', 'Sg', 'Bh',
-                        'Hs', 'Mt', 'Ds', 'Rg', 'Cn', 'Nh', 'Fl', 'Mc', 'Lv', 'Ts', 'Og'}
     for element in elements_count.keys():
-        if element in metallic_elements:
+        if element in METALLIC_ELEMENTS:
             return 'not applicable'
         
     if 'C' in elements_count:
@@ -218,6 +260,50 @@ def calculate_unsaturation_degree(elements_count):
         return unsaturation_degree
     else:
         return 'not an organic compound'
+
+def canonical_formula(elements):
+    """
+    Build a canonical formula string in Hill order
+    Carbon first, then hydrogen, then remaining elements alphabetically;
+    without carbon all elements are listed alphabetically
+    
+    Args:
+        elements (dict): Element counts dictionary
+    
+    Returns:
+        str: Canonical formula (e.g., "C2H4O2" for "CH3COOH")
+    """
+    if 'C' in elements:
+        order = ['C'] + (['H'] if 'H' in elements else [])
+        order += sorted(element for element in elements if element not in ('C', 'H'))
+    else:
+        order = sorted(elements)
+    
+    return ''.join(element + (str(elements[element]) if elements[element] != 1 else '')
+                   for element in order)
+
+def classify_from_flags(has_carbon, has_hydrogen, has_metal):
+    """
+    Classify compound from precomputed composition flags
+    
+    Args:
+        has_carbon (bool): Compound contains carbon
+        has_hydrogen (bool): Compound contains hydrogen
+        has_metal (bool): Compound contains one of CLASSIFICATION_METALS
+    
+    Returns:
+        str: Compound classification
+    """
+    if has_carbon:
+        if has_metal:
+            return "Organometallic Compound"
+        elif has_hydrogen:
+            return "Organic Compound"
+        else:
+            return "Inorganic Carbon Compound"
+    else:
+        return "Inorganic Compound"
+
 # Main execution flow
 def main():
     """Main function to run the chemical analyzer"""
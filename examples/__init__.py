@@ -10,6 +10,9 @@ Modules:
     custom_elements.py  - Adding custom elements and isotopes  
     export_results.py   - Exporting analysis results
     advanced_analysis.py - Comprehensive analysis with classification
+    empirical_formula.py - Empirical formulas from mass percentages
+    formula_library.py  - Combinatorial formula library generation
+    mass_annotation.py  - Peak list annotation by monoisotopic mass
 """
 
 __version__ = "1.0.0"
@@ -21,5 +24,8 @@ __all__ = [
     'batch_processing', 
     'custom_elements',
     'export_results',
-    'advanced_analysis'
+    'advanced_analysis',
+    'empirical_formula',
+    'formula_library',
+    'mass_annotation'
 ]
@@ -8,7 +8,9 @@ from chemical_analyzer import (
     parse_chemical_formula,
     calculate_molecular_weight,
     calculate_element_percentages,
-    calculate_unsaturation_degree
+    calculate_unsaturation_degree,
+    classify_from_flags,
+    CLASSIFICATION_METALS
 )
 
 def comprehensive_analysis(formula):
@@ -21,30 +23,8 @@ def comprehensive_analysis(formula):
     Returns:
         dict: Comprehensive analysis results
     """
-    # Basic chemical analysis
-    elements = parse_chemical_formula(formula)
-    mass = calculate_molecular_weight(elements)
-    percentages = calculate_element_percentages(elements, mass)
-    unsat = calculate_unsaturation_degree(elements)
-    
-    # Additional statistics
-    total_atoms = sum(elements.values())
-    different_elements = len(elements)
-    
-    # Compound classification
-    compound_type = classify_compound(elements)
-    
-    # Structure comprehensive results
-    return {
-        'formula': formula,
-        'elements': elements,
-        'molecular_weight': mass,
-        'mass_percentages': percentages,
-        'unsaturation_degree': unsat,
-        'total_atoms': total_atoms,
-        'different_elements': different_elements,
-        'compound_type': compound_type
-    }
+    # Evaluate every registered standard property for a single formula
+    return analyze_fields([formula], COMPREHENSIVE_FIELDS)[0]
 
 def classify_compound(elements):
     """
@@ -58,18 +38,130 @@ def classify_compound(elements):
     """
     has_carbon = 'C' in elements
     has_hydrogen = 'H' in elements
-    has_metal = any(element in ['Na', 'K', 'Ca', 'Mg', 'Fe', 'Cu', 'Zn', 'Ag', 'Au'] 
-                   for element in elements.keys())
-    
-    if has_carbon:
-        if has_metal:
-            return "Organometallic Compound"
-        elif has_hydrogen:
-            return "Organic Compound"
-        else:
-            return "Inorganic Carbon Compound"
-    else:
-        return "Inorganic Compound"
+    has_metal = any(element in CLASSIFICATION_METALS for element in elements.keys())
+    
+    return classify_from_flags(has_carbon, has_hydrogen, has_metal)
+
+# Property registry: property name -> (dependency names, compute function)
+# The 'formula' input is always available and needs no registration
+PROPERTY_REGISTRY = {}
+
+def register_property(name, dependencies, compute, replace=False):
+    """
+    Register an analysis property and the properties it depends on
+    
+    Args:
+        name (str): Property name used in field projections
+        dependencies (list): Names of properties passed to compute, in order
+        compute (callable): Function receiving dependency values positionally
+        replace (bool): Allow redefining a standard property, which changes
+                        comprehensive_analysis for every caller
+    """
+    if name == 'formula':
+        raise ValueError("'formula' is the analysis input and cannot be redefined")
+    if name in PROPERTY_REGISTRY and name in COMPREHENSIVE_FIELDS and not replace:
+        raise ValueError(f"'{name}' is a standard property; pass replace=True to redefine it")
+    PROPERTY_REGISTRY[name] = (tuple(dependencies), compute)
+
+def resolve_evaluation_order(fields):
+    """
+    Resolve the minimal set of properties needed for the requested fields
+    
+    Args:
+        fields (list): Requested property names
+    
+    Returns:
+        list: Property names in dependency order (dependencies first)
+    """
+    order = []
+    visited = set()
+    in_progress = set()
+    
+    def visit(name):
+        # The formula itself is the root of every dependency chain
+        if name == 'formula' or name in visited:
+            return
+        if name in in_progress:
+            raise ValueError(f"Circular dependency involving property '{name}'")
+        if name not in PROPERTY_REGISTRY:
+            raise ValueError(f"Unknown property '{name}'")
+        
+        in_progress.add(name)
+        for dependency in PROPERTY_REGISTRY[name][0]:
+            visit(dependency)
+        in_progress.discard(name)
+        
+        visited.add(name)
+        order.append(name)
+    
+    for field in fields:
+        visit(field)
+    return order
+
+def analyze_fields(formulas, fields):
+    """
+    Analyze formulas computing only the requested fields and their dependencies
+    
+    Args:
+        formulas (list): List of chemical formula strings
+        fields (list): Property names to include in each result
+    
+    Returns:
+        list: One dictionary per formula with 'formula' plus requested fields
+    
+    Note:
+        Repeated formulas are evaluated once per batch; only the requested
+        fields are kept for them, and dict/list/set values are copied into
+        every result so results never share mutable objects
+    """
+    # Resolve the dependency graph once for the whole batch
+    order = resolve_evaluation_order(fields)
+    steps = [(name,) + PROPERTY_REGISTRY[name] for name in order]
+    
+    results = []
+    # Memoize requested fields so repeated formulas are evaluated once;
+    # intermediates are discarded as soon as each formula is done
+    cache = {}
+    
+    for formula in formulas:
+        if formula not in cache:
+            # Each intermediate (composition, weight, ...) is computed once
+            values = {'formula': formula}
+            for name, dependencies, compute in steps:
+                values[name] = compute(*[values[dependency] for dependency in dependencies])
+            cache[formula] = {field: values[field] for field in fields}
+        
+        cached = cache[formula]
+        result = {'formula': formula}
+        for field in fields:
+            value = cached[field]
+            # Copy mutable values so each result owns its own objects
+            if isinstance(value, (dict, list, set)):
+                value = value.copy()
+            result[field] = value
+        results.append(result)
+    
+    return results
+
+# Standard properties used by comprehensive_analysis
+register_property('elements', ['formula'], parse_chemical_formula)
+register_property('molecular_weight', ['elements'], calculate_molecular_weight)
+register_property('mass_percentages', ['elements', 'molecular_weight'],
+                  calculate_element_percentages)
+register_property('unsaturation_degree', ['elements'], calculate_unsaturation_degree)
+register_property('total_atoms', ['elements'], lambda elements: sum(elements.values()))
+register_property('different_elements', ['elements'], len)
+register_property('compound_type', ['elements'], classify_compound)
+
+COMPREHENSIVE_FIELDS = [
+    'elements',
+    'molecular_weight',
+    'mass_percentages',
+    'unsaturation_degree',
+    'total_atoms',
+    'different_elements',
+    'compound_type'
+]
 
 def print_analysis_report(analysis):
     """
@@ -121,6 +213,22 @@ def main():
         except Exception as e:
             print(f"❌ Error analyzing {compound}: {e}")
             print("-" * 50)
+    
+    # Field projection: only the weight (and the composition it needs) is computed
+    print("\nMolecular weight only (lazy evaluation):")
+    for result in analyze_fields(test_compounds, ['molecular_weight']):
+        print(f"  {result['formula']:10} {result['molecular_weight']:8.3f} g/mol")
+    
+    # User-defined property built on top of a shared intermediate; it is
+    # removed again afterwards so the demo leaves the registry unchanged
+    register_property('carbon_fraction', ['elements', 'total_atoms'],
+                      lambda elements, total: elements.get('C', 0) / total if total else 0.0)
+    try:
+        print("\nCarbon atom fraction (custom property):")
+        for result in analyze_fields(test_compounds, ['carbon_fraction']):
+            print(f"  {result['formula']:10} {result['carbon_fraction']:.2f}")
+    finally:
+        PROPERTY_REGISTRY.pop('carbon_fraction', None)
 
 if __name__ == "__main__":
     main()
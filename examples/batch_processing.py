@@ -3,6 +3,13 @@ Batch Processing Example
 Demonstrates analyzing multiple chemical formulas efficiently
 """
 
+# Import required libraries for file scanning
+import mmap
+import os
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
 # Import required functions from the main module
 from chemical_analyzer import (
     parse_chemical_formula,
@@ -47,6 +54,268 @@ def analyze_multiple_formulas(formula_list):
     
     return results
 
+# Tokens of a formula in bytes: element symbol with optional count,
+# opening bracket, or closing bracket with optional multiplier
+FORMULA_TOKEN = re.compile(rb'([A-Z][a-z]*)(\d*)|([(\[])|([)\]])(\d*)')
+
+# Any bracket; formulas without one can take the flat fast path
+BRACKET = re.compile(rb'[()\[\]]')
+
+# Group-free element tokens for formulas without brackets
+FLAT_ELEMENT_TOKEN = re.compile(rb'[A-Z][a-z]*\d*')
+ELEMENT_TOKEN = re.compile(rb'([A-Z][a-z]*)(\d*)')
+
+# Formula part of every line: leading blanks skipped, stops at a comment
+LINE_FORMULA = re.compile(rb'^[ \t]*([^#\r\n]*)', re.MULTILINE)
+
+# Default size of the byte ranges handed to worker processes
+CHUNK_SIZE = 64 * 1024 * 1024
+
+# Distinct formulas remembered per byte range before the memo is reset
+MEMO_LIMIT = 100000
+
+# Lines sampled per byte range to decide whether memoization pays off
+MEMO_SAMPLE = 10000
+
+# Element token cache: raw token (e.g., b'H12') -> ('H', 12), so each
+# distinct token is decoded and converted only once
+_token_cache = {}
+
+def _element_token(token):
+    """
+    Return the (symbol, count) pair for a raw element token
+    
+    Args:
+        token (bytes): Element token such as b'Fe2' or b'O'
+    
+    Returns:
+        tuple: (element symbol, count)
+    """
+    info = _token_cache.get(token)
+    if info is None:
+        symbol, count = ELEMENT_TOKEN.match(token).groups()
+        info = _token_cache[token] = (symbol.decode('ascii'), int(count) if count else 1)
+    return info
+
+def parse_formula_bytes(data, start=0, end=None):
+    """
+    Parse a chemical formula directly from a bytes-like buffer
+    Equivalent to parse_chemical_formula for well-formed formulas but works
+    on a range of bytes or an mmap without decoding it; bytes that are not
+    part of a token (lowercase-led symbols, whitespace) are ignored, so
+    "h2o" parses to an empty composition. Unbalanced brackets raise
+    ValueError instead of being ignored
+    
+    Args:
+        data (bytes-like): Buffer containing the formula
+        start (int): Offset of the first formula byte
+        end (int): Offset just past the last formula byte
+    
+    Returns:
+        dict: Dictionary with elements as keys and counts as values
+    """
+    if end is None:
+        end = len(data)
+    
+    elements_count = {}
+    
+    # Fast path: formulas without brackets are a flat list of element tokens
+    if BRACKET.search(data, start, end) is None:
+        for token in FLAT_ELEMENT_TOKEN.findall(data, start, end):
+            element, count = _token_cache.get(token) or _element_token(token)
+            elements_count[element] = elements_count.get(element, 0) + count
+        return elements_count
+    
+    stack = []
+    for symbol, count, opening, closing, multiplier in (
+            FORMULA_TOKEN.findall(data, start, end)):
+        if symbol:
+            element, count = _element_token(symbol + count)
+            elements_count[element] = elements_count.get(element, 0) + count
+        elif opening:
+            # Save current state for the nested group
+            stack.append(elements_count)
+            elements_count = {}
+        else:
+            if not stack:
+                raise ValueError(f"Unmatched closing bracket {closing.decode('ascii')!r}")
+            # Apply the multiplier and merge into the outer group
+            factor = int(multiplier) if multiplier else 1
+            group_counts = elements_count
+            elements_count = stack.pop()
+            for element, count in group_counts.items():
+                elements_count[element] = elements_count.get(element, 0) + count * factor
+    
+    if stack:
+        raise ValueError(f"{len(stack)} unclosed bracket(s)")
+    
+    return elements_count
+
+def split_byte_ranges(path, chunk_size=CHUNK_SIZE):
+    """
+    Split a file into newline-aligned byte ranges of roughly chunk_size bytes
+    
+    Args:
+        path (str): Path to the formula file
+        chunk_size (int): Target size of each range in bytes
+    
+    Returns:
+        list: List of (start, end) byte offset tuples covering the file
+    """
+    size = os.path.getsize(path)
+    if size == 0:
+        return []
+    
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        ranges = []
+        start = 0
+        while size - start > chunk_size:
+            # Move each boundary forward to the start of the next line
+            newline = mm.find(b'\n', start + chunk_size)
+            if newline == -1:
+                break
+            ranges.append((start, newline + 1))
+            start = newline + 1
+        if start < size:
+            ranges.append((start, size))
+    
+    return ranges
+
+def _parse_line(data, start, end):
+    """
+    Parse one formula line, turning a malformed formula into an error entry
+    
+    Args:
+        data (bytes-like): Buffer containing the formula
+        start (int): Offset of the first formula byte
+        end (int): Offset just past the last formula byte
+    
+    Returns:
+        dict: Elements count dictionary, or {'error': message}
+    """
+    try:
+        return parse_formula_bytes(data, start, end)
+    except ValueError as e:
+        return {'error': str(e)}
+
+def scan_formula_lines(data, start, end):
+    """
+    Parse every formula line within a byte range of a buffer
+    Blank lines, lines without element tokens and '#' comments (full-line
+    or trailing) are skipped, and lines are never decoded. Large files
+    often repeat the same formulas, so the first MEMO_SAMPLE lines of a
+    range are memoized by their formula bytes (one short copy per line);
+    if fewer than half of them repeat, memoization is switched off and the
+    remaining lines are parsed in place from the buffer without copying
+    
+    Args:
+        data (bytes-like): Buffer containing the file contents
+        start (int): Offset of the first byte of the range (line aligned)
+        end (int): Offset just past the last byte of the range
+    
+    Returns:
+        list: List of (line_offset, result) tuples in file order, where
+              line_offset is the byte position of the formula's line and
+              result is the elements count dictionary, or {'error': message}
+              for a malformed line
+    """
+    results = []
+    memo = {}
+    lookups = 0
+    hits = 0
+    
+    # One regex pass finds the formula part of every line in the range
+    for match in LINE_FORMULA.finditer(data, start, end):
+        formula_start, formula_end = match.span(1)
+        if formula_start == formula_end:
+            continue
+        
+        if memo is None:
+            elements_count = _parse_line(data, formula_start, formula_end)
+        else:
+            key = match.group(1)
+            elements_count = memo.get(key)
+            lookups += 1
+            if elements_count is None:
+                if len(memo) >= MEMO_LIMIT:
+                    memo.clear()
+                elements_count = memo[key] = _parse_line(data, formula_start, formula_end)
+            else:
+                hits += 1
+            # Each result receives its own copy of a memoized composition
+            elements_count = elements_count.copy()
+            if lookups == MEMO_SAMPLE and hits * 2 < lookups:
+                memo = None
+        
+        if elements_count:
+            results.append((match.start(), elements_count))
+    
+    return results
+
+def scan_byte_range(path, start, end):
+    """
+    Memory-map a formula file and parse the formulas in one byte range
+    Runs in worker processes; each worker maps the file independently
+    
+    Args:
+        path (str): Path to the formula file
+        start (int): Offset of the first byte of the range
+        end (int): Offset just past the last byte of the range
+    
+    Returns:
+        list: List of (line_offset, result) tuples in file order
+    """
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return scan_formula_lines(mm, start, end)
+
+def scan_formula_file(path, workers=None, chunk_size=CHUNK_SIZE):
+    """
+    Parse a large formula file in parallel across CPU cores
+    The file is split into many fixed-size chunks; at most two chunks per
+    worker are in flight at once, so memory stays bounded by the chunk
+    size rather than the file size
+    
+    Args:
+        path (str): Path to the formula file
+        workers (int): Number of worker processes (defaults to CPU count)
+        chunk_size (int): Target size of each chunk in bytes
+    
+    Yields:
+        list: Per-chunk result lists in file order, see merge_range_results
+    """
+    workers = workers or os.cpu_count() or 1
+    ranges = split_byte_ranges(path, chunk_size)
+    if workers == 1 or len(ranges) <= 1:
+        for start, end in ranges:
+            yield scan_byte_range(path, start, end)
+        return
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for start, end in ranges:
+            pending.append(executor.submit(scan_byte_range, path, start, end))
+            # Yield the oldest chunk once the window is full to keep order
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def merge_range_results(range_results):
+    """
+    Merge per-chunk scan results into a single list in file order
+    For very large files iterate over scan_formula_file directly instead
+    
+    Args:
+        range_results (iterable): Result lists yielded by scan_formula_file
+    
+    Returns:
+        list: List of (line_offset, result) tuples
+    """
+    merged = []
+    for results in range_results:
+        merged.extend(results)
+    return merged
+
 def main():
     """
     Main function demonstrating batch processing capabilities
@@ -83,6 +352,19 @@ def main():
             print(f"✅ {result['formula']:10} | "
                   f"MW: {result['molecular_weight']:7.2f} g/mol | "
                   f"Elements: {result['elements']}")
+    
+    # Scan the bundled formula file directly from bytes in parallel
+    formula_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'formulas.txt')
+    scanned = merge_range_results(scan_formula_file(formula_file, workers=2))
+    
+    print(f"\nSCANNED {len(scanned)} FORMULAS FROM {os.path.basename(formula_file)}:")
+    print("-" * 60)
+    for offset, elements in scanned:
+        if 'error' in elements:
+            print(f"@{offset:5} | ERROR - {elements['error']}")
+            continue
+        mass = calculate_molecular_weight(elements)
+        print(f"@{offset:5} | MW: {mass:7.2f} g/mol | Elements: {elements}")
 
 if __name__ == "__main__":
     main()
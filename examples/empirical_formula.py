@@ -0,0 +1,294 @@
+"""
+Empirical Formula Example
+Demonstrates solving empirical and molecular formulas from elemental
+analysis data (mass percentages) for whole batches of lab samples
+"""
+
+# Import required libraries
+from itertools import product
+from math import ceil, floor, gcd
+
+# Import chemical analysis functions
+from chemical_analyzer import (
+    calculate_molecular_weight,
+    calculate_element_percentages,
+    canonical_formula,
+    ATOMIC_MASS
+)
+
+# Typical acceptance window for elemental analysis (percentage points)
+PERCENTAGE_TOLERANCE = 0.4
+
+# Allowed relative difference between a solved and a known molecular weight
+WEIGHT_TOLERANCE = 0.002
+
+def rational_approximation(value, tolerance, max_denominator):
+    """
+    Find the simplest fraction p/q close to a value using continued fractions
+    The first convergent with |q * value - p| <= tolerance * q * value is
+    returned, so larger scaled ratios are allowed proportionally more error
+
+    Args:
+        value (float): Positive number to approximate
+        tolerance (float): Allowed relative deviation of q * value from an integer
+        max_denominator (int): Largest denominator to consider
+
+    Returns:
+        tuple: (numerator, denominator) of the approximation
+    """
+    # Convergents h/k built from the continued fraction expansion of value
+    h_prev, h = 1, int(value)
+    k_prev, k = 0, 1
+    remainder = value - int(value)
+    best = (h, k)
+
+    while abs(k * value - h) > tolerance * k * value and remainder > 1e-12:
+        remainder = 1.0 / remainder
+        term = int(remainder)
+        remainder -= term
+        h_prev, h = h, term * h + h_prev
+        k_prev, k = k, term * k + k_prev
+        if k > max_denominator:
+            break
+        best = (h, k)
+
+    return best
+
+def solve_mole_ratios(ratios, tolerance, max_multiplier):
+    """
+    Find the smallest integer counts proportional to a set of mole ratios
+
+    Args:
+        ratios (dict): Element mole ratios normalized to the smallest value
+        tolerance (float): Allowed relative deviation of a scaled ratio from an integer
+        max_multiplier (int): Largest multiplier applied to the ratios
+
+    Returns:
+        tuple: (integer counts dict, multiplier used)
+    """
+    # Combine per-element denominators into one common multiplier
+    multiplier = 1
+    for ratio in ratios.values():
+        denominator = rational_approximation(ratio, tolerance, max_multiplier)[1]
+        multiplier = multiplier * denominator // gcd(multiplier, denominator)
+
+    # Fall back to the multiplier with the smallest worst-case relative deviation
+    if multiplier > max_multiplier:
+        multiplier = min(range(1, max_multiplier + 1),
+                         key=lambda m: max(abs(m * r - round(m * r)) / (m * r)
+                                           for r in ratios.values()))
+
+    counts = {element: max(1, round(multiplier * ratio)) for element, ratio in ratios.items()}
+    return reduce_counts(counts)[0], multiplier
+
+def reduce_counts(counts):
+    """
+    Divide element counts by their greatest common divisor
+
+    Args:
+        counts (dict): Positive integer element counts
+
+    Returns:
+        tuple: (reduced counts dict, common divisor)
+    """
+    divisor = 0
+    for count in counts.values():
+        divisor = gcd(divisor, count)
+    return {element: count // divisor for element, count in counts.items()}, divisor
+
+def solve_counts_for_weight(percentages, known_weight):
+    """
+    Find the integer counts that best reproduce the percentages at a known
+    molecular weight
+    Each count is bounded by the range MW * (pct +/- PERCENTAGE_TOLERANCE) /
+    (100 * atomic mass); the element with the widest range is solved from
+    the weight left over by the others, and candidates whose weight is off
+    by more than WEIGHT_TOLERANCE are rejected
+
+    Args:
+        percentages (dict): Positive measured mass percentages as floats
+        known_weight (float): Known molecular weight
+
+    Returns:
+        tuple: (counts dict, max deviation) of the best candidate, or None
+               when no candidate matches the molecular weight
+    """
+    bounds = {}
+    for element, percentage in percentages.items():
+        atoms = known_weight / (100 * ATOMIC_MASS[element])
+        low = max(1, floor(atoms * (percentage - PERCENTAGE_TOLERANCE)))
+        bounds[element] = (low, max(low, ceil(atoms * (percentage + PERCENTAGE_TOLERANCE))))
+
+    # Enumerate all but the widest range; its count follows from the weight
+    elements = sorted(bounds, key=lambda element: bounds[element][1] - bounds[element][0])
+    last = elements.pop()
+    last_low, last_high = bounds[last]
+
+    best = None
+    for candidate in product(*(range(bounds[element][0], bounds[element][1] + 1)
+                               for element in elements)):
+        counts = dict(zip(elements, candidate))
+        partial_weight = sum(ATOMIC_MASS[element] * count for element, count in counts.items())
+        last_count = round((known_weight - partial_weight) / ATOMIC_MASS[last])
+        if not last_low <= last_count <= last_high:
+            continue
+        counts[last] = last_count
+        weight = partial_weight + ATOMIC_MASS[last] * last_count
+        if abs(weight - known_weight) > WEIGHT_TOLERANCE * known_weight:
+            continue
+        deviation = percentage_deviation(counts, percentages)
+        if best is None or deviation < best[1]:
+            best = (counts, deviation)
+
+    return best
+
+def percentage_deviation(counts, percentages):
+    """
+    Largest difference between a formula's mass percentages and measured ones
+
+    Args:
+        counts (dict): Element counts of the candidate formula
+        percentages (dict): Measured mass percentages as floats
+
+    Returns:
+        float: Maximum absolute deviation in percentage points
+    """
+    solved = calculate_element_percentages(counts, calculate_molecular_weight(counts))
+    return max(abs(float(solved[element].rstrip('%')) - percentages.get(element, 0.0))
+               for element in solved)
+
+def solve_empirical_formulas(samples, molecular_weights=None, tolerance=0.1,
+                             max_multiplier=12):
+    """
+    Solve empirical (and optionally molecular) formulas for a batch of samples
+    With a known molecular weight the counts are solved directly against it
+    (see solve_counts_for_weight); otherwise mole ratios are cleared to
+    the smallest integers that reproduce the percentages
+
+    Args:
+        samples (list): Dictionaries of element -> mass percentage, given as
+                        numbers or strings like '40.00%'
+        molecular_weights (list): Optional known molecular weight per sample
+                                  (None entries are allowed)
+        tolerance (float): Allowed relative deviation of scaled mole ratios
+                           from integers
+        max_multiplier (int): Largest multiplier tried when clearing fractions
+
+    Returns:
+        list: List of dictionaries containing the solved formulas
+    """
+    if molecular_weights is None:
+        molecular_weights = [None] * len(samples)
+    elif len(molecular_weights) != len(samples):
+        raise ValueError(f"Got {len(molecular_weights)} molecular weights "
+                         f"for {len(samples)} samples")
+
+    # Reciprocal atomic masses are looked up once for the whole batch
+    elements_in_batch = {element for sample in samples for element in sample}
+    reciprocal_mass = {element: 1.0 / ATOMIC_MASS[element]
+                       for element in elements_in_batch
+                       if ATOMIC_MASS.get(element)}
+
+    results = []
+    for sample, known_weight in zip(samples, molecular_weights):
+        try:
+            # Convert mass percentages to relative moles
+            percentages = {element: float(str(value).rstrip('%'))
+                           for element, value in sample.items()}
+            unknown = [element for element in percentages if element not in reciprocal_mass]
+            if unknown:
+                raise ValueError(f"Unknown elements: {', '.join(unknown)}")
+            moles = {element: percentage * reciprocal_mass[element]
+                     for element, percentage in percentages.items() if percentage > 0}
+            if not moles:
+                raise ValueError("Sample contains no positive mass percentages")
+
+            smallest = min(moles, key=moles.get)
+
+            if known_weight:
+                # Solve molecular counts against the known weight, then reduce
+                solved = solve_counts_for_weight(
+                    {element: percentages[element] for element in moles}, known_weight)
+                if solved is None:
+                    raise ValueError(f"No formula within {PERCENTAGE_TOLERANCE} points "
+                                     f"matches molecular weight {known_weight}")
+                molecular_counts, deviation = solved
+                counts, formula_units = reduce_counts(molecular_counts)
+                multiplier = counts[smallest]
+            else:
+                ratios = {element: mole / moles[smallest] for element, mole in moles.items()}
+
+                # Tighten the ratio tolerance until the formula reproduces the
+                # measured percentages, keeping the best fit found
+                best = None
+                ratio_tolerance = tolerance
+                while ratio_tolerance > 1e-3:
+                    counts, multiplier = solve_mole_ratios(ratios, ratio_tolerance, max_multiplier)
+                    deviation = percentage_deviation(counts, percentages)
+                    if best is None or deviation < best[2]:
+                        best = (counts, multiplier, deviation)
+                    if deviation <= PERCENTAGE_TOLERANCE:
+                        break
+                    ratio_tolerance /= 2
+                counts, multiplier, deviation = best
+                molecular_counts = None
+            empirical_weight = calculate_molecular_weight(counts)
+
+            # Confidence: how well the solved formula reproduces the measurements
+            confidence = max(0.0, 1.0 - deviation / (2 * PERCENTAGE_TOLERANCE))
+            if known_weight:
+                weight_error = abs(empirical_weight * formula_units - known_weight) / known_weight
+                confidence *= max(0.0, 1.0 - weight_error * 10)
+
+            results.append({
+                'percentages': percentages,
+                'empirical_formula': canonical_formula(counts),
+                'empirical_counts': counts,
+                'empirical_weight': empirical_weight,
+                'molecular_formula': canonical_formula(molecular_counts) if known_weight else None,
+                'molecular_counts': molecular_counts,
+                'multiplier': multiplier,
+                'max_deviation': deviation,
+                'confidence': round(confidence, 3)
+            })
+        except Exception as e:
+            # Keep going with the rest of the batch
+            results.append({
+                'percentages': sample,
+                'error': str(e)
+            })
+
+    return results
+
+def main():
+    """
+    Main function demonstrating empirical formula solving
+    """
+    print("=== EMPIRICAL FORMULA SOLVER ===\n")
+
+    # Elemental analysis results with optional known molecular weights
+    samples = [
+        ({'C': 40.00, 'H': 6.71, 'O': 53.29}, 180.16),   # Glucose
+        ({'C': 92.26, 'H': 7.74}, 78.11),                # Benzene
+        ({'Fe': 69.94, 'O': 30.06}, None),               # Iron(III) oxide
+        ({'C': 49.48, 'H': 5.19, 'N': 28.85, 'O': 16.48}, 194.19),  # Caffeine
+        ({'Na': '39.34%', 'Cl': '60.66%'}, None),        # Sodium chloride
+        ({'Xx': 50.0, 'O': 50.0}, None),                 # Invalid element
+    ]
+
+    results = solve_empirical_formulas([sample for sample, weight in samples],
+                                       [weight for sample, weight in samples])
+
+    print("RESULTS:")
+    print("-" * 70)
+    for result in results:
+        if 'error' in result:
+            print(f"❌ {result['percentages']}: ERROR - {result['error']}")
+        else:
+            molecular = result['molecular_formula'] or '-'
+            print(f"✅ Empirical: {result['empirical_formula']:10} | "
+                  f"Molecular: {molecular:10} | "
+                  f"Confidence: {result['confidence']:.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -6,13 +6,17 @@ Demonstrates how to export chemical analysis results to JSON and CSV files
 # Import required libraries for data export
 import json
 import csv
+import sqlite3
 from datetime import datetime
+from itertools import islice
 
 # Import chemical analysis functions
 from chemical_analyzer import (
     parse_chemical_formula,
     calculate_molecular_weight,
-    calculate_element_percentages
+    calculate_element_percentages,
+    canonical_formula,
+    ATOMIC_MASS
 )
 
 def analyze_and_export(formulas, output_format='json'):
@@ -21,7 +25,7 @@ def analyze_and_export(formulas, output_format='json'):
     
     Args:
         formulas (list): List of chemical formula strings
-        output_format (str): Export format - 'json' or 'csv'
+        output_format (str): Export format - 'json', 'csv' or 'sqlite'
     
     Returns:
         list: Analysis results
@@ -72,8 +76,152 @@ def analyze_and_export(formulas, output_format='json'):
                 ])
         print(f"✅ Results exported to {filename}")
     
+    # Export to SQLite database
+    elif output_format == 'sqlite':
+        filename = 'chemical_analysis.db'
+        rows = export_to_sqlite(results, filename)
+        print(f"✅ {rows} results exported to {filename}")
+    
     return results
 
+# Table layout for the SQLite export: one row per compound plus a
+# normalized compound-element table for per-element queries
+SQLITE_SCHEMA = [
+    '''CREATE TABLE IF NOT EXISTS compounds (
+           canonical_formula TEXT PRIMARY KEY,
+           formula TEXT NOT NULL,
+           molecular_weight REAL NOT NULL,
+           analysis_date TEXT
+       )''',
+    '''CREATE TABLE IF NOT EXISTS compound_elements (
+           canonical_formula TEXT NOT NULL,
+           element TEXT NOT NULL,
+           count INTEGER NOT NULL,
+           mass_percentage REAL,
+           PRIMARY KEY (canonical_formula, element)
+       ) WITHOUT ROWID'''
+]
+
+SQLITE_INDEXES = {
+    'idx_compounds_molecular_weight': 'compounds (molecular_weight)',
+    'idx_compound_elements_element': 'compound_elements (element)'
+}
+
+# Conflict handling per load mode, keyed by canonical formula
+SQLITE_INSERT_SQL = {
+    'append': (
+        '''INSERT OR IGNORE INTO compounds
+           (canonical_formula, formula, molecular_weight, analysis_date)
+           VALUES (?, ?, ?, ?)''',
+        '''INSERT OR IGNORE INTO compound_elements
+           (canonical_formula, element, count, mass_percentage)
+           VALUES (?, ?, ?, ?)'''
+    ),
+    'upsert': (
+        '''INSERT INTO compounds
+           (canonical_formula, formula, molecular_weight, analysis_date)
+           VALUES (?, ?, ?, ?)
+           ON CONFLICT (canonical_formula) DO UPDATE SET
+               formula = excluded.formula,
+               molecular_weight = excluded.molecular_weight,
+               analysis_date = excluded.analysis_date''',
+        '''INSERT INTO compound_elements
+           (canonical_formula, element, count, mass_percentage)
+           VALUES (?, ?, ?, ?)
+           ON CONFLICT (canonical_formula, element) DO UPDATE SET
+               count = excluded.count,
+               mass_percentage = excluded.mass_percentage'''
+    )
+}
+
+def export_to_sqlite(results, database='chemical_analysis.db', mode='append',
+                     batch_size=50000, rebuild_indexes=None):
+    """
+    Bulk load analysis results into a SQLite database
+    Rows are written with batched executemany calls, one transaction per
+    batch; for bulk loads indexes are dropped and built once after loading
+    
+    Args:
+        results (iterable): Result dictionaries as produced by analyze_and_export
+        database (str): Path to the SQLite database file
+        mode (str): 'append' keeps existing compounds, 'upsert' replaces them
+        batch_size (int): Number of compounds written per transaction
+        rebuild_indexes (bool): Drop indexes before loading and rebuild them
+                                afterwards; by default only when the compounds
+                                table starts empty, so small appends to a large
+                                table keep their existing indexes
+    
+    Returns:
+        int: Number of result rows processed
+    """
+    if mode not in SQLITE_INSERT_SQL:
+        raise ValueError(f"Unknown mode '{mode}', expected 'append' or 'upsert'")
+    compound_sql, element_sql = SQLITE_INSERT_SQL[mode]
+    
+    # isolation_level=None lets us control transactions explicitly
+    connection = sqlite3.connect(database, isolation_level=None)
+    try:
+        # Pragmas tuned for bulk loading
+        connection.execute('PRAGMA journal_mode = WAL')
+        connection.execute('PRAGMA synchronous = NORMAL')
+        connection.execute('PRAGMA temp_store = MEMORY')
+        connection.execute('PRAGMA cache_size = -262144')
+        
+        for statement in SQLITE_SCHEMA:
+            connection.execute(statement)
+        if rebuild_indexes is None:
+            rebuild_indexes = connection.execute(
+                'SELECT 1 FROM compounds LIMIT 1').fetchone() is None
+        if rebuild_indexes:
+            # Drop indexes so they are built once at the end instead of per row
+            for index_name in SQLITE_INDEXES:
+                connection.execute(f'DROP INDEX IF EXISTS {index_name}')
+        
+        total = 0
+        iterator = iter(results)
+        while True:
+            batch = list(islice(iterator, batch_size))
+            if not batch:
+                break
+            
+            compound_rows = []
+            element_rows = []
+            for result in batch:
+                composition = result['composition']
+                key = canonical_formula(composition)
+                compound_rows.append((key, result['formula'],
+                                      result['molecular_weight'],
+                                      result.get('analysis_date')))
+                molecular_weight = result['molecular_weight']
+                for element, count in composition.items():
+                    # Full-precision percentage rather than the rounded display string
+                    percentage = None
+                    if molecular_weight:
+                        percentage = ATOMIC_MASS.get(element, 0) * count * 100 / molecular_weight
+                    element_rows.append((key, element, count, percentage))
+            
+            # One large transaction per batch
+            connection.execute('BEGIN')
+            try:
+                connection.executemany(compound_sql, compound_rows)
+                connection.executemany(element_sql, element_rows)
+                connection.execute('COMMIT')
+            except Exception:
+                connection.execute('ROLLBACK')
+                raise
+            total += len(batch)
+    finally:
+        try:
+            # Build indexes after loading, even if the load failed part way,
+            # so the database is never left without them
+            for index_name, target in SQLITE_INDEXES.items():
+                connection.execute(f'CREATE INDEX IF NOT EXISTS {index_name} ON {target}')
+            connection.execute('PRAGMA optimize')
+        finally:
+            connection.close()
+    
+    return total
+
 def main():
     """
     Main function demonstrating data export capabilities
@@ -99,10 +247,15 @@ def main():
     print("\n2. Exporting to CSV format:")
     csv_results = analyze_and_export(compounds, 'csv')
     
+    # Export to SQLite database
+    print("\n3. Exporting to SQLite database:")
+    analyze_and_export(compounds, 'sqlite')
+    
     # Display summary of results
     print(f"\n📊 ANALYSIS SUMMARY:")
     print(f"   Total compounds processed: {len(compounds)}")
-    print(f"   Export files created: chemical_analysis.json, chemical_analysis.csv")
+    print(f"   Export files created: chemical_analysis.json, chemical_analysis.csv, "
+          f"chemical_analysis.db")
     
     # Preview first result
     if json_results:
@@ -0,0 +1,190 @@
+"""
+Formula Library Example
+Demonstrates generating combinatorial formula libraries (substitutions,
+homologues, hydrates) with properties updated incrementally per rule
+"""
+
+# Import chemical analysis functions
+from chemical_analyzer import (
+    parse_chemical_formula,
+    canonical_formula,
+    classify_from_flags,
+    ATOMIC_MASS,
+    METALLIC_ELEMENTS,
+    CLASSIFICATION_METALS
+)
+
+HALOGENS = {'F', 'Cl', 'Br', 'I'}
+
+def substitution_rule(old, new, max_count=1, name=None):
+    """
+    Create a rule replacing one fragment with another (e.g., Cl -> Br)
+
+    Args:
+        old (str): Fragment formula removed on each application
+        new (str): Fragment formula added on each application
+        max_count (int): Maximum number of applications
+        name (str): Rule name (defaults to "old->new")
+
+    Returns:
+        dict: Substitution rule
+    """
+    delta = {}
+    for element, count in parse_chemical_formula(new).items():
+        delta[element] = delta.get(element, 0) + count
+    for element, count in parse_chemical_formula(old).items():
+        delta[element] = delta.get(element, 0) - count
+
+    return {
+        'name': name or f'{old}->{new}',
+        'delta': {element: count for element, count in delta.items() if count},
+        'max_count': max_count
+    }
+
+def addition_rule(fragment, max_count=1, name=None):
+    """
+    Create a rule adding a fragment (e.g., CH2 homologues, H2O hydrates)
+
+    Args:
+        fragment (str): Fragment formula added on each application
+        max_count (int): Maximum number of applications
+        name (str): Rule name (defaults to "+fragment")
+
+    Returns:
+        dict: Addition rule
+    """
+    return {
+        'name': name or f'+{fragment}',
+        'delta': parse_chemical_formula(fragment),
+        'max_count': max_count
+    }
+
+def tracked_quantities(elements):
+    """
+    Compute the additive quantities the library engine updates incrementally
+
+    Args:
+        elements (dict): Element counts (may be a per-rule delta)
+
+    Returns:
+        list: [molecular weight, unsaturation numerator without the +2 term,
+               carbon count, hydrogen count, unsaturation metal count,
+               classification metal count]
+    """
+    weight = 0.0
+    numerator = 0
+    metals = 0
+    classification_metals = 0
+    for element, count in elements.items():
+        weight += ATOMIC_MASS.get(element, 0) * count
+        # Terms of DU = (2C + 2 + N - H - X)/2, see calculate_unsaturation_degree
+        if element == 'C':
+            numerator += 2 * count
+        elif element == 'N':
+            numerator += count
+        elif element == 'H' or element in HALOGENS:
+            numerator -= count
+        if element in METALLIC_ELEMENTS:
+            metals += count
+        if element in CLASSIFICATION_METALS:
+            classification_metals += count
+
+    return [weight, numerator, elements.get('C', 0), elements.get('H', 0),
+            metals, classification_metals]
+
+def generate_library(base, rules, deduplicate=True):
+    """
+    Lazily enumerate every variant of a base compound under a set of rules
+    Each rule is applied 0..max_count times; variants are visited in
+    odometer order so each step adds or removes a single rule delta and
+    properties are updated from precomputed per-rule deltas
+
+    Args:
+        base (str or dict): Base formula or element counts dictionary
+        rules (list): Rules from substitution_rule / addition_rule
+        deduplicate (bool): Skip variants whose composition was already yielded
+
+    Yields:
+        dict: Variant with formula, elements, molecular weight, unsaturation
+              degree, compound type and the rule applications used
+    """
+    counts = dict(parse_chemical_formula(base) if isinstance(base, str) else base)
+    state = tracked_quantities(counts)
+    rule_deltas = [tracked_quantities(rule['delta']) for rule in rules]
+    touched = {element for rule in rules for element in rule['delta']}
+    applied = [0] * len(rules)
+    seen = set()
+
+    while True:
+        # Variants that would need a negative count are not chemically valid
+        if all(counts.get(element, 0) >= 0 for element in touched):
+            elements = {element: count for element, count in counts.items() if count}
+            key = frozenset(elements.items())
+            if not deduplicate or key not in seen:
+                if deduplicate:
+                    seen.add(key)
+                weight, numerator, carbon, hydrogen, metals, classification_metals = state
+
+                if metals:
+                    unsaturation = 'not applicable'
+                elif carbon:
+                    unsaturation = int((numerator + 2) / 2)
+                else:
+                    unsaturation = 'not an organic compound'
+
+                yield {
+                    'formula': canonical_formula(elements),
+                    'elements': elements,
+                    'molecular_weight': weight,
+                    'unsaturation_degree': unsaturation,
+                    'compound_type': classify_from_flags(carbon > 0, hydrogen > 0,
+                                                         classification_metals > 0),
+                    'applied': {rule['name']: times for rule, times in zip(rules, applied)}
+                }
+
+        # Advance the odometer: apply one more of the first rule that has
+        # room left, rolling back exhausted rules before it
+        for index, rule in enumerate(rules):
+            step = 1 if applied[index] < rule['max_count'] else -applied[index]
+            applied[index] += step
+            for element, count in rule['delta'].items():
+                counts[element] = counts.get(element, 0) + count * step
+            for position, delta in enumerate(rule_deltas[index]):
+                state[position] += delta * step
+            if step == 1:
+                break
+        else:
+            return
+
+def main():
+    """
+    Main function demonstrating combinatorial library generation
+    """
+    print("=== COMBINATORIAL FORMULA LIBRARY ===\n")
+
+    # Chlorobenzene with halogen swaps, alkyl homologues and hydrates
+    base = "C6H5Cl"
+    rules = [
+        substitution_rule('Cl', 'Br'),
+        addition_rule('CH2', max_count=3),
+        addition_rule('H2O', max_count=2),
+    ]
+
+    print(f"Base compound: {base}")
+    print(f"Rules: {', '.join(rule['name'] for rule in rules)}\n")
+
+    print("VARIANTS:")
+    print("-" * 70)
+    for variant in generate_library(base, rules):
+        applied = ', '.join(f"{name} x{times}" for name, times in variant['applied'].items()
+                            if times) or 'base'
+        print(f"{variant['formula']:14} | MW: {variant['molecular_weight']:7.2f} g/mol | "
+              f"DU: {variant['unsaturation_degree']} | {applied}")
+
+    # Equivalent rules produce identical compositions only once
+    duplicates = [addition_rule('CH2', max_count=2), addition_rule('C2H4', max_count=1)]
+    unique = list(generate_library("CH4", duplicates))
+    print(f"\nCH4 with +CH2 x0-2 and +C2H4 x0-1: {len(unique)} unique of 6 combinations")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Mass Annotation Example
+Demonstrates annotating sorted instrument peak lists against a catalog of
+known compounds using monoisotopic masses and common adducts
+"""
+
+# Import required libraries
+from bisect import bisect_left
+
+# Import chemical analysis functions
+from chemical_analyzer import (
+    parse_chemical_formula,
+    calculate_monoisotopic_mass,
+    MONOISOTOPIC_MASS
+)
+
+ELECTRON_MASS = 0.00054857990946
+PROTON_MASS = MONOISOTOPIC_MASS['H'] - ELECTRON_MASS
+
+# Common adducts: name -> (mass added to the neutral molecule, charge)
+DEFAULT_ADDUCTS = {
+    '[M+H]+': (PROTON_MASS, 1),
+    '[M+Na]+': (MONOISOTOPIC_MASS['Na'] - ELECTRON_MASS, 1),
+    '[M+K]+': (MONOISOTOPIC_MASS['K'] - ELECTRON_MASS, 1),
+    '[M+NH4]+': (MONOISOTOPIC_MASS['N'] + 4 * MONOISOTOPIC_MASS['H'] - ELECTRON_MASS, 1),
+}
+
+def adduct_mz(neutral_mass, adduct):
+    """
+    Calculate the m/z of an adduct ion
+
+    Args:
+        neutral_mass (float): Monoisotopic mass of the neutral molecule
+        adduct (tuple): (mass shift, charge) as in DEFAULT_ADDUCTS
+
+    Returns:
+        float: Mass-to-charge ratio of the ion
+    """
+    shift, charge = adduct
+    return (neutral_mass + shift) / abs(charge)
+
+def build_mass_index(formulas, adducts=None):
+    """
+    Build a sorted m/z index over a compound catalog
+
+    Args:
+        formulas (list): Catalog of chemical formula strings
+        adducts (dict): Adduct definitions (defaults to DEFAULT_ADDUCTS)
+
+    Returns:
+        dict: Parallel lists 'mz', 'formula', 'adduct' and 'neutral_mass',
+              sorted by ascending m/z
+    """
+    if adducts is None:
+        adducts = DEFAULT_ADDUCTS
+
+    entries = []
+    for formula in formulas:
+        elements = parse_chemical_formula(formula)
+        missing = [element for element in elements if element not in MONOISOTOPIC_MASS]
+        if missing:
+            raise ValueError(f"No monoisotopic mass for {', '.join(missing)} in {formula}")
+        neutral_mass = calculate_monoisotopic_mass(elements)
+
+        # Precompute every adduct ion for the compound
+        for name, adduct in adducts.items():
+            entries.append((adduct_mz(neutral_mass, adduct), formula, name, neutral_mass))
+
+    entries.sort()
+    return {
+        'mz': [entry[0] for entry in entries],
+        'formula': [entry[1] for entry in entries],
+        'adduct': [entry[2] for entry in entries],
+        'neutral_mass': [entry[3] for entry in entries]
+    }
+
+def annotate_peaks(peaks, index, ppm=5.0):
+    """
+    Annotate a sorted peak list against a mass index in a single pass
+    Both sequences are ascending, so the start of each peak's tolerance
+    window only moves forward (merge-join); bisect is used to jump over
+    long runs of index entries between peaks
+
+    Args:
+        peaks (list): Observed m/z values in ascending order
+        index (dict): Mass index from build_mass_index
+        ppm (float): Tolerance in parts per million of the theoretical m/z
+
+    Returns:
+        list: List of (peak position, formula, adduct, ppm error) tuples
+    """
+    index_mz = index['mz']
+    index_formula = index['formula']
+    index_adduct = index['adduct']
+    size = len(index_mz)
+    tolerance = ppm * 1e-6
+
+    annotations = []
+    start = 0
+    previous = float('-inf')
+    for position, peak in enumerate(peaks):
+        if peak < previous:
+            raise ValueError(f"Peak list is not sorted at position {position}")
+        previous = peak
+
+        # Theoretical masses m with |peak - m| <= m * tolerance
+        low = peak / (1 + tolerance)
+        high = peak / (1 - tolerance)
+
+        # Advance the window start; never moves backwards
+        start = bisect_left(index_mz, low, start)
+        match = start
+        while match < size and index_mz[match] <= high:
+            theoretical = index_mz[match]
+            annotations.append((position, index_formula[match], index_adduct[match],
+                                (peak - theoretical) / theoretical * 1e6))
+            match += 1
+
+    return annotations
+
+def main():
+    """
+    Main function demonstrating peak list annotation
+    """
+    print("=== PEAK LIST ANNOTATION ===\n")
+
+    # Catalog of known compounds
+    catalog = ["C6H12O6", "C8H10N4O2", "C9H8O4", "C2H5OH", "CH3COOH",
+               "C17H21NO4", "C12H22O11", "C6H8O7"]
+    index = build_mass_index(catalog)
+    print(f"Mass index: {len(index['mz'])} ions from {len(catalog)} compounds\n")
+
+    # Observed peaks (sorted m/z) from the instrument
+    peaks = [61.0284, 115.0031, 181.0707, 195.0877, 203.0526, 217.0265,
+             250.0000, 304.1543, 343.1235, 365.1054]
+
+    print("ANNOTATIONS:")
+    print("-" * 60)
+    annotated = set()
+    for position, formula, adduct, error in annotate_peaks(peaks, index, ppm=10.0):
+        annotated.add(position)
+        print(f"m/z {peaks[position]:10.4f} | {formula:10} {adduct:9} | {error:+6.2f} ppm")
+
+    for position, peak in enumerate(peaks):
+        if position not in annotated:
+            print(f"m/z {peak:10.4f} | no match")
+
+if __name__ == "__main__":
+    main()
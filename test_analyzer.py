@@ -3,13 +3,60 @@ Test suite for Chemical Formula Analyzer
 Run this file to test the functionality with various chemical formulas
 """
 
+import os
+import random
+import sqlite3
+import tempfile
+
 from chemical_analyzer import (
     parse_chemical_formula,
     calculate_molecular_weight,
     calculate_element_percentages,
-    calculate_unsaturation_degree
+    calculate_unsaturation_degree,
+    canonical_formula
+)
+from examples.mass_annotation import build_mass_index, annotate_peaks
+from examples.export_results import export_to_sqlite
+from examples.empirical_formula import solve_empirical_formulas, WEIGHT_TOLERANCE
+from examples.advanced_analysis import (
+    classify_compound,
+    comprehensive_analysis,
+    analyze_fields,
+    register_property,
+    resolve_evaluation_order,
+    PROPERTY_REGISTRY
+)
+from examples.formula_library import (
+    generate_library,
+    substitution_rule,
+    addition_rule
+)
+from examples.batch_processing import (
+    parse_formula_bytes,
+    scan_formula_lines,
+    scan_formula_file,
+    merge_range_results
 )
 
+# Formula file shipped with the examples
+FORMULAS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             'examples', 'formulas.txt')
+
+def read_formulas():
+    """
+    Read formulas from the examples file, dropping blank lines and comments
+    
+    Returns:
+        list: Formula strings in file order
+    """
+    formulas = []
+    with open(FORMULAS_FILE, encoding='utf-8') as f:
+        for line in f:
+            formula = line.split('#')[0].strip()
+            if formula:
+                formulas.append(formula)
+    return formulas
+
 def run_tests():
     """
     Run comprehensive tests on various chemical formulas
@@ -50,5 +97,359 @@ def run_tests():
         except Exception as e:
             print(f"ERROR with {formula}: {e}")
 
+def test_analyze_fields_evaluates_only_needed_steps():
+    """A projection resolves only its dependencies and evaluates each formula once"""
+    assert resolve_evaluation_order(['molecular_weight']) == ['elements', 'molecular_weight']
+    
+    calls = []
+    def counted_weight(weight):
+        calls.append(weight)
+        return weight
+    
+    register_property('counted_weight', ['molecular_weight'], counted_weight)
+    try:
+        results = analyze_fields(["H2O", "H2O", "CO2"], ['counted_weight'])
+    finally:
+        PROPERTY_REGISTRY.pop('counted_weight', None)
+    
+    assert len(calls) == 2
+    assert [set(result) for result in results] == [{'formula', 'counted_weight'}] * 3
+
+def test_resolve_evaluation_order_rejects_unknown_and_cyclic_fields():
+    """Unknown properties and dependency cycles raise ValueError"""
+    for fields in (['no_such_property'], ['cycle_a']):
+        register_property('cycle_a', ['cycle_b'], lambda value: value)
+        register_property('cycle_b', ['cycle_a'], lambda value: value)
+        try:
+            resolve_evaluation_order(fields)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"expected ValueError for {fields}")
+        finally:
+            PROPERTY_REGISTRY.pop('cycle_a', None)
+            PROPERTY_REGISTRY.pop('cycle_b', None)
+
+def test_register_property_protects_standard_fields():
+    """Standard properties can only be redefined with replace=True"""
+    try:
+        register_property('molecular_weight', ['elements'], len)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError when redefining a standard property")
+    assert comprehensive_analysis("H2O")['molecular_weight'] == calculate_molecular_weight({'H': 2, 'O': 1})
+
+def test_analyze_fields_results_do_not_share_values():
+    """Repeated formulas get independent copies of mutable values"""
+    results = analyze_fields(["H2O", "H2O"], ['elements', 'mass_percentages'])
+    results[0]['elements']['X'] = 1
+    results[0]['mass_percentages'].clear()
+    assert results[1]['elements'] == {'H': 2, 'O': 1}
+    assert results[1]['mass_percentages'] == {'H': '11.19%', 'O': '88.81%'}
+
+def test_comprehensive_analysis_matches_direct_computation():
+    """The registry-based comprehensive_analysis returns the original result dict"""
+    for formula in ["C6H12O6", "H2SO4", "NaCl", "CO2", "Fe(CO)5", ""]:
+        elements = parse_chemical_formula(formula)
+        mass = calculate_molecular_weight(elements)
+        expected = {
+            'formula': formula,
+            'elements': elements,
+            'molecular_weight': mass,
+            'mass_percentages': calculate_element_percentages(elements, mass),
+            'unsaturation_degree': calculate_unsaturation_degree(elements),
+            'total_atoms': sum(elements.values()),
+            'different_elements': len(elements),
+            'compound_type': classify_compound(elements)
+        }
+        result = comprehensive_analysis(formula)
+        assert result == expected, formula
+        assert list(result) == list(expected)
+
+def export_row(formula, molecular_weight=None):
+    """
+    Build a result row shaped like those produced by analyze_and_export
+    
+    Args:
+        formula (str): Chemical formula string
+        molecular_weight (float): Override for the computed molecular weight
+    
+    Returns:
+        dict: Result row
+    """
+    elements = parse_chemical_formula(formula)
+    mass = calculate_molecular_weight(elements)
+    return {
+        'formula': formula,
+        'composition': elements,
+        'molecular_weight': molecular_weight if molecular_weight is not None else mass,
+        'mass_percentages': calculate_element_percentages(elements, mass),
+        'analysis_date': '2026-01-01T00:00:00'
+    }
+
+def sqlite_index_sql(database):
+    """
+    Return the definitions of the exporter's secondary indexes
+    
+    Args:
+        database (str): Path to the SQLite database file
+    
+    Returns:
+        dict: Index name -> CREATE INDEX statement
+    """
+    connection = sqlite3.connect(database)
+    try:
+        return dict(connection.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx_%'"))
+    finally:
+        connection.close()
+
+def test_export_to_sqlite_row_counts_and_percentages():
+    """Compounds and the normalized element table receive every row"""
+    with tempfile.TemporaryDirectory() as directory:
+        database = os.path.join(directory, 'results.db')
+        rows = [export_row(formula) for formula in ["H2O", "C6H12O6", "Fe2(SO4)3"]]
+        assert export_to_sqlite(rows, database, batch_size=2) == 3
+        
+        connection = sqlite3.connect(database)
+        try:
+            assert connection.execute('SELECT COUNT(*) FROM compounds').fetchone() == (3,)
+            assert connection.execute('SELECT COUNT(*) FROM compound_elements').fetchone() == (8,)
+            percentage, = connection.execute(
+                "SELECT mass_percentage FROM compound_elements "
+                "WHERE canonical_formula = 'H2O' AND element = 'H'").fetchone()
+        finally:
+            connection.close()
+        assert abs(percentage - 2 * 1.008 * 100 / calculate_molecular_weight({'H': 2, 'O': 1})) < 1e-9
+
+def test_export_to_sqlite_append_and_upsert():
+    """Append keeps the stored compound, upsert replaces it"""
+    with tempfile.TemporaryDirectory() as directory:
+        database = os.path.join(directory, 'results.db')
+        export_to_sqlite([export_row("H2O")], database)
+        
+        # "OH2" has the same canonical formula as "H2O"
+        export_to_sqlite([export_row("OH2", 99.0)], database, mode='append')
+        connection = sqlite3.connect(database)
+        try:
+            assert connection.execute('SELECT formula, molecular_weight FROM compounds').fetchall() \
+                == [('H2O', calculate_molecular_weight({'H': 2, 'O': 1}))]
+        finally:
+            connection.close()
+        
+        export_to_sqlite([export_row("OH2", 99.0)], database, mode='upsert')
+        connection = sqlite3.connect(database)
+        try:
+            assert connection.execute('SELECT formula, molecular_weight FROM compounds').fetchall() \
+                == [('OH2', 99.0)]
+        finally:
+            connection.close()
+
+def test_export_to_sqlite_restores_indexes_after_failed_load():
+    """Indexes dropped for a bulk load are rebuilt even when the load fails"""
+    with tempfile.TemporaryDirectory() as directory:
+        database = os.path.join(directory, 'results.db')
+        export_to_sqlite([export_row("H2O")], database)
+        try:
+            export_to_sqlite([export_row("CO2"), {'formula': 'broken'}], database,
+                             batch_size=1, rebuild_indexes=True)
+        except KeyError:
+            pass
+        else:
+            raise AssertionError("expected KeyError for a row without composition")
+        assert set(sqlite_index_sql(database)) == {'idx_compounds_molecular_weight',
+                                                   'idx_compound_elements_element'}
+
+def test_export_to_sqlite_rebuilds_indexes_only_for_empty_tables():
+    """By default indexes are rebuilt when loading into an empty table only"""
+    with tempfile.TemporaryDirectory() as directory:
+        for existing_rows, rebuild_indexes, rebuilt in [([], None, True),
+                                                        (["H2O"], None, False),
+                                                        (["H2O"], True, True)]:
+            database = os.path.join(directory, f'results_{len(existing_rows)}_{rebuild_indexes}.db')
+            export_to_sqlite([export_row(formula) for formula in existing_rows], database)
+            
+            # Replace the index with a marker definition; a rebuild restores the original
+            connection = sqlite3.connect(database)
+            connection.execute('DROP INDEX idx_compounds_molecular_weight')
+            connection.execute('CREATE INDEX idx_compounds_molecular_weight ON compounds (formula)')
+            connection.commit()
+            connection.close()
+            
+            export_to_sqlite([export_row("CO2")], database, rebuild_indexes=rebuild_indexes)
+            index_sql = sqlite_index_sql(database)['idx_compounds_molecular_weight']
+            assert index_sql.endswith('(molecular_weight)') == rebuilt, (existing_rows, rebuild_indexes)
+
+def test_parse_formula_bytes_matches_string_parser():
+    """Byte-level parser agrees with parse_chemical_formula on the examples file"""
+    for formula in read_formulas() + ["K4[Fe(CN)6]", "((CH3)3C)2O", "CH3COOH"]:
+        assert parse_formula_bytes(formula.encode()) == parse_chemical_formula(formula), formula
+
+def test_parse_formula_bytes_malformed_input():
+    """Lowercase-led symbols are ignored by the byte parser but not by the string parser"""
+    assert parse_formula_bytes(b'h2o') == {}
+    assert parse_chemical_formula('h2o') == {'ho': 2}
+
+def test_parse_formula_bytes_rejects_unbalanced_brackets():
+    """Stray closing and unclosed brackets are errors with or without nesting"""
+    for formula in [b'SO4)2', b'Fe2(SO4', b'(SO4))2', b'K4[Fe(CN)6', b'Ca]2']:
+        try:
+            parse_formula_bytes(formula)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"expected ValueError for {formula!r}")
+
+def test_scan_formula_lines_reports_malformed_lines():
+    """A malformed line becomes an error entry and scanning continues"""
+    data = b"H2O\n(SO4))2\nCO2\n"
+    scanned = scan_formula_lines(data, 0, len(data))
+    assert [offset for offset, result in scanned] == [0, 4, 12]
+    assert scanned[0][1] == {'H': 2, 'O': 1}
+    assert 'error' in scanned[1][1]
+    assert scanned[2][1] == {'C': 1, 'O': 2}
+
+def test_scan_formula_file_order_independent_of_workers():
+    """Merged scan results keep file order for any number of workers and chunks"""
+    expected = [parse_chemical_formula(formula) for formula in read_formulas()]
+    for workers in (1, 2, 3, 8):
+        # Small chunks force the file to be split into many ranges
+        scanned = merge_range_results(scan_formula_file(FORMULAS_FILE, workers=workers,
+                                                        chunk_size=16))
+        assert [elements for offset, elements in scanned] == expected, workers
+        assert [offset for offset, elements in scanned] == sorted(offset for offset, elements in scanned)
+
+def test_generate_library_matches_full_recomputation():
+    """Incrementally updated properties equal those computed from scratch"""
+    rules = [
+        substitution_rule('Cl', 'Br', max_count=2),
+        addition_rule('CH2', max_count=3),
+        addition_rule('H2O', max_count=2),
+        substitution_rule('H', 'Na'),
+    ]
+    for base in ["C6H4Cl2", "CCl4", "NaCl", "FeCl3"]:
+        for variant in generate_library(base, rules, deduplicate=False):
+            elements = variant['elements']
+            assert abs(variant['molecular_weight'] - calculate_molecular_weight(elements)) < 1e-9
+            assert variant['unsaturation_degree'] == calculate_unsaturation_degree(elements)
+            assert variant['compound_type'] == classify_compound(elements)
+
+def test_generate_library_skips_negative_counts():
+    """Variants that would remove more atoms than the base has are skipped"""
+    variants = list(generate_library("C2H6", [substitution_rule('H', 'Cl', max_count=8)]))
+    assert len(variants) == 7
+    assert [variant['elements'].get('Cl', 0) for variant in variants] == list(range(7))
+    assert all(count > 0 for variant in variants for count in variant['elements'].values())
+
+def test_generate_library_deduplicates_compositions():
+    """Equivalent rule combinations yield each composition once"""
+    rules = [addition_rule('CH2', max_count=2), addition_rule('C2H4', max_count=1)]
+    formulas = [variant['formula'] for variant in generate_library("CH4", rules)]
+    assert formulas == ["CH4", "C2H6", "C3H8", "C4H10", "C5H12"]
+
+def test_solve_empirical_formulas_round_trip():
+    """Formulas are recovered from their own mass percentages and weights"""
+    formulas = ["C6H12O6", "C8H10N4O2", "C12H22O11", "C9H8O4", "C17H21NO4",
+                "Fe2(SO4)3", "CH3COOH", "C6H8O7", "KMnO4", "Ca3(PO4)2"]
+    samples = []
+    weights = []
+    for formula in formulas:
+        elements = parse_chemical_formula(formula)
+        weight = calculate_molecular_weight(elements)
+        samples.append(calculate_element_percentages(elements, weight))
+        weights.append(weight)
+    
+    for formula, result in zip(formulas, solve_empirical_formulas(samples, weights)):
+        assert result['molecular_formula'] == canonical_formula(parse_chemical_formula(formula))
+        assert result['confidence'] > 0.9, formula
+    
+    # Without a molecular weight only the empirical formula is reported
+    glucose = solve_empirical_formulas(samples[:1])[0]
+    assert glucose['empirical_formula'] == "CH2O"
+    assert glucose['molecular_formula'] is None
+
+def test_solve_empirical_formulas_noisy_percentages():
+    """Known molecular weights pin down formulas despite +/-0.3 point noise"""
+    result = solve_empirical_formulas([{'C': 67.10, 'H': 7.10, 'N': 4.55, 'O': 21.25}],
+                                      [303.36])[0]
+    assert result['molecular_formula'] == "C17H21NO4"
+    
+    formulas = ["C6H12O6", "C8H10N4O2", "C12H22O11", "C9H8O4", "C17H21NO4",
+                "Fe2(SO4)3", "CH3COOH", "C6H8O7", "KMnO4", "Ca3(PO4)2",
+                "C2H5OH", "C6H6", "C10H8", "C7H5N3O6"]
+    generator = random.Random(29)
+    samples = []
+    weights = []
+    expected = []
+    for formula in formulas:
+        elements = parse_chemical_formula(formula)
+        weight = calculate_molecular_weight(elements)
+        percentages = calculate_element_percentages(elements, weight)
+        for _ in range(20):
+            samples.append({element: float(value.rstrip('%')) + generator.uniform(-0.3, 0.3)
+                            for element, value in percentages.items()})
+            weights.append(round(weight, 2))
+            expected.append(canonical_formula(elements))
+    
+    for weight, formula, result in zip(weights, expected,
+                                       solve_empirical_formulas(samples, weights)):
+        assert result['molecular_formula'] == formula, (formula, result)
+        solved_weight = calculate_molecular_weight(result['molecular_counts'])
+        assert abs(solved_weight - weight) <= WEIGHT_TOLERANCE * weight
+    
+    # A weight no formula can match is reported instead of a wrong formula
+    result = solve_empirical_formulas([{'C': 40.00, 'H': 6.71, 'O': 53.29}], [250.0])[0]
+    assert 'error' in result
+
+def test_solve_empirical_formulas_rejects_mismatched_weights():
+    """A molecular weight list of the wrong length is an error"""
+    try:
+        solve_empirical_formulas([{'C': 40.0, 'H': 6.71, 'O': 53.29}] * 2, [180.16])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError for mismatched lengths")
+
+def test_annotate_peaks_matches_brute_force_scan():
+    """Merge-join annotation finds exactly the matches of a full ppm scan"""
+    catalog = ["C%dH%dO%d" % (carbon, hydrogen, oxygen)
+               for carbon in range(1, 20) for hydrogen in range(2, 40, 3)
+               for oxygen in range(0, 6)]
+    index = build_mass_index(catalog)
+    ppm = 5.0
+    
+    # Random peaks plus exact and near hits on indexed ions
+    generator = random.Random(42)
+    peaks = [generator.uniform(10, 400) for _ in range(2000)]
+    peaks += [mz * (1 + generator.uniform(-8, 8) * 1e-6) for mz in index['mz'][::7]]
+    peaks.sort()
+    
+    expected = sorted((position, formula, adduct)
+                      for position, peak in enumerate(peaks)
+                      for mz, formula, adduct in zip(index['mz'], index['formula'], index['adduct'])
+                      if abs(peak - mz) <= mz * ppm * 1e-6)
+    assert expected
+    annotated = annotate_peaks(peaks, index, ppm=ppm)
+    assert sorted((position, formula, adduct)
+                  for position, formula, adduct, error in annotated) == expected
+    assert all(abs(error) <= ppm for position, formula, adduct, error in annotated)
+
+def test_build_mass_index_respects_empty_adducts():
+    """An empty adduct table yields an empty index instead of the defaults"""
+    index = build_mass_index(["C6H12O6"], adducts={})
+    assert index['mz'] == []
+    assert annotate_peaks([181.0707], index) == []
+
+def test_annotate_peaks_rejects_unsorted_peaks():
+    """Peak lists must be sorted for the single-pass merge-join"""
+    index = build_mass_index(["H2O"])
+    try:
+        annotate_peaks([20.0, 19.0], index)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError for unsorted peaks")
+
 if __name__ == "__main__":
     run_tests()